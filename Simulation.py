@@ -19,6 +19,7 @@ Usage examples:
   python sim_topic_counter.py --runs 50 --mode server   # Uses running Flask API at http://localhost:5500
   python sim_topic_counter.py --runs 20 --mode offline  # Calls ai_agent directly without server
   python sim_topic_counter.py --base-url http://localhost:5500 --runs 5
+  python sim_topic_counter.py --measure-prompts         # Prompt size per age, no AI calls
 
 Notes:
 - Server mode expects the Flask app (python app.py) to be running locally.
@@ -186,6 +187,7 @@ class OfflineSimulator:
         self.job_title = "Unemployed"
         self.loans: List[Dict[str, Any]] = []
         self.life_events: List[str] = []
+        self.life_summary: Dict[str, Any] = ai_agent.new_life_summary()
 
     @staticmethod
     def _event_type_and_specifier(age: int) -> (str, str):
@@ -226,7 +228,8 @@ class OfflineSimulator:
                 if event_type == "job":
                     # Fix: ai_agent.generate_jo expects (name, age, income, title, life_events)
                     name = f"Player{random.randint(1,999)}"
-                    event = ai_agent.generate_jo(name, age, self.income, self.job_title, self.life_events)
+                    event = ai_agent.generate_jo(name, age, self.income, self.job_title, self.life_events,
+                                                 life_summary=self.life_summary)
                     if isinstance(event, dict):
                         events.append(event)
                         # Optionally apply choice to evolve state
@@ -234,7 +237,8 @@ class OfflineSimulator:
                 else:
                     # Fix: ai_agent.generate_mcq expects (name, age, date, balance, income, life_events, specifier)
                     name = f"Player{random.randint(1,999)}"
-                    event = ai_agent.generate_mcq(name, age, sim_date, self.balance, self.income, self.life_events, specifier)
+                    event = ai_agent.generate_mcq(name, age, sim_date, self.balance, self.income, self.life_events, specifier,
+                                                  life_summary=self.life_summary)
                     if isinstance(event, dict):
                         events.append(event)
             except Exception:
@@ -253,13 +257,48 @@ def aggregate_counts(all_events: List[Dict[str, Any]]) -> Dict[str, int]:
     return counts
 
 
+def measure_prompt_sizes() -> List[Dict[str, int]]:
+    """Build the prompt for every age with a synthetic, growing life history.
+
+    No model is called. Returns per-age character counts of the prompt built
+    with the rolling life-event context and of the raw life_events list that
+    used to be interpolated, so the two growth curves can be compared.
+    """
+    life_events: List[str] = []
+    life_summary = ai_agent.new_life_summary()
+    income, title = 0, "Unemployed"
+    rows: List[Dict[str, int]] = []
+    for age in range(OfflineSimulator.START_AGE, OfflineSimulator.END_AGE):
+        event_type, specifier = OfflineSimulator._event_type_and_specifier(age)
+        if event_type == "job":
+            prompt = ai_agent.build_jo_prompt("Player", age, income, title, life_events, life_summary=life_summary)
+            income, title = income + 5000, f"Level {age} Associate"
+            life_events.append(f"Became a {title}")
+        else:
+            prompt = ai_agent.build_mcq_prompt("Player", age, f"{2008 + age}-01-01", 10000, income,
+                                               life_events, specifier, life_summary=life_summary)
+            life_events.append(f"Age {age} decision on {specifier if specifier != 'N/A' else 'a financial dilemma'}")
+        rows.append({"age": age, "prompt_chars": len(prompt), "raw_events_chars": len(str(life_events))})
+    return rows
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run FinLife simulations and count AI question topics.")
     parser.add_argument("--runs", type=int, default=10, help="Number of simulation runs")
     parser.add_argument("--base-url", type=str, default="http://localhost:5500", help="FinLife server base URL")
     parser.add_argument("--mode", choices=["auto", "server", "offline"], default="auto", help="Run mode")
+    parser.add_argument("--measure-prompts", action="store_true", help="Print prompt size per age and exit")
     args = parser.parse_args()
 
+    if args.measure_prompts:
+        if ai_agent is None:
+            print("[error] Prompt measurement requires running from repo root (ai_agent import failed).")
+            sys.exit(3)
+        print("age\tprompt_chars\traw_events_chars")
+        for row in measure_prompt_sizes():
+            print(f"{row['age']}\t{row['prompt_chars']}\t{row['raw_events_chars']}")
+        return
+
     all_events: List[Dict[str, Any]] = []
 
     mode = args.mode
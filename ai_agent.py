@@ -1,23 +1,258 @@
 import os
+import re
 import json
-from dotenv import load_dotenv
-import google.generativeai as genai
 
-load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+MODEL_NAME = 'gemini-flash-latest'
+MAX_REPAIR_ATTEMPTS = 1
 
-def _call_generative_model(prompt):
+_genai = None
+
+def _get_genai():
+    """Import and configure the Gemini SDK on first use; it is slow to import and unused by most callers."""
+    global _genai
+    if _genai is None:
+        from dotenv import load_dotenv
+        import google.generativeai as genai
+
+        load_dotenv()
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _genai = genai
+    return _genai
+
+MCQ_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "scenario_title": {"type": "STRING"},
+        "scenario_description": {"type": "STRING"},
+        "choices": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "description": {"type": "STRING"},
+                    "financial_impact": {
+                        "type": "OBJECT",
+                        "properties": {
+                            "action": {"type": "STRING", "enum": ["DEPOSIT", "WITHDRAWAL"]},
+                            "amount": {"type": "INTEGER"},
+                            "description": {"type": "STRING"}
+                        },
+                        "required": ["action", "amount", "description"]
+                    }
+                },
+                "required": ["description", "financial_impact"]
+            }
+        }
+    },
+    "required": ["scenario_title", "scenario_description", "choices"]
+}
+
+JO_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "scenario_title": {"type": "STRING"},
+        "scenario_description": {"type": "STRING"},
+        "choices": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "description": {"type": "STRING"},
+                    "financial_impact": {
+                        "type": "OBJECT",
+                        "properties": {
+                            "income": {"type": "INTEGER"},
+                            "title": {"type": "STRING"}
+                        },
+                        "required": ["income", "title"]
+                    }
+                },
+                "required": ["description", "financial_impact"]
+            }
+        }
+    },
+    "required": ["scenario_title", "scenario_description", "choices"]
+}
+
+FS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "persona_title": {"type": "STRING"},
+        "summary": {"type": "STRING"},
+        "best_decision": {"type": "STRING"},
+        "worst_decision": {"type": "STRING"}
+    },
+    "required": ["persona_title", "summary", "best_decision", "worst_decision"]
+}
+
+def _parse_json_text(text):
+    cleaned_text = text.replace("```json", "").replace("```", "").strip()
     try:
-        model = genai.GenerativeModel('gemini-flash-latest')
-        response = model.generate_content(prompt)
-        cleaned_text = response.text.replace("```json", "").replace("```", "").strip()
         return json.loads(cleaned_text)
+    except json.JSONDecodeError:
+        pass
+
+    # Trim any prose around the outermost object and drop trailing commas.
+    start = cleaned_text.find("{")
+    end = cleaned_text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("Response did not contain a JSON object.")
+    candidate = re.sub(r",\s*([}\]])", r"\1", cleaned_text[start:end + 1])
+    return json.loads(candidate)
+
+def _to_int(value):
+    if isinstance(value, bool):
+        raise ValueError(f"Expected an integer amount, got {value!r}.")
+    if isinstance(value, (int, float)):
+        return int(round(value))
+    if isinstance(value, str):
+        digits = re.sub(r"[^0-9.\-]", "", value)
+        if digits not in ("", "-", "."):
+            return int(round(float(digits)))
+    raise ValueError(f"Expected an integer amount, got {value!r}.")
+
+def _check_scenario(data, n_choices):
+    if not isinstance(data, dict):
+        raise ValueError("Response must be a JSON object.")
+    for key in ("scenario_title", "scenario_description"):
+        if not isinstance(data.get(key), str) or not data[key].strip():
+            raise ValueError(f'"{key}" must be a non-empty string.')
+    choices = data.get("choices")
+    if not isinstance(choices, list) or len(choices) != n_choices:
+        raise ValueError(f'"choices" must be a list of exactly {n_choices} items.')
+    for i, choice in enumerate(choices):
+        if not isinstance(choice, dict) or not isinstance(choice.get("description"), str):
+            raise ValueError(f'choices[{i}] must have a string "description".')
+        if not isinstance(choice.get("financial_impact"), dict):
+            raise ValueError(f'choices[{i}] must have a "financial_impact" object.')
+    return choices
+
+def validate_mcq(data):
+    """Validate an MCQ scenario in place, repairing minor shape issues."""
+    for i, choice in enumerate(_check_scenario(data, 3)):
+        impact = choice["financial_impact"]
+        action = str(impact.get("action", "")).strip().upper()
+        if action not in ("DEPOSIT", "WITHDRAWAL"):
+            raise ValueError(f'choices[{i}].financial_impact.action must be "DEPOSIT" or "WITHDRAWAL".')
+        amount = _to_int(impact.get("amount"))
+        if amount < 0:
+            raise ValueError(f"choices[{i}].financial_impact.amount must not be negative; the action carries the direction.")
+
+        # The "(+$...)"/"(-$...)" suffix is what the player sees, so it must match the
+        # action and the amount actually posted.
+        suffix = re.search(r"\(([+-])\$([0-9][0-9,]*(?:\.[0-9]+)?)\)\s*$", choice["description"])
+        if not suffix:
+            raise ValueError(f'choices[{i}].description must end with (+$<amount>) or (-$<amount>).')
+        sign = suffix.group(1)
+        shown = int(round(float(suffix.group(2).replace(",", ""))))
+        if shown != amount:
+            raise ValueError(f'choices[{i}] description shows ${shown:,} but financial_impact.amount is {amount}.')
+        if amount != 0 and sign != ("-" if action == "WITHDRAWAL" else "+"):
+            raise ValueError(f'choices[{i}] description says ({sign}$...) but financial_impact is a {action}.')
+        impact["action"] = action
+        impact["amount"] = amount
+        impact["description"] = str(impact.get("description") or choice["description"]).strip()
+    return data
+
+def validate_jo(data):
+    """Validate a job offer scenario in place, repairing minor shape issues."""
+    for i, choice in enumerate(_check_scenario(data, 2)):
+        impact = choice["financial_impact"]
+        income = _to_int(impact.get("income"))
+        if income < 0:
+            raise ValueError(f"choices[{i}].financial_impact.income must not be negative.")
+        title = impact.get("title")
+        if not isinstance(title, str) or not title.strip():
+            raise ValueError(f'choices[{i}].financial_impact.title must be a non-empty string.')
+        impact["income"] = income
+        impact["title"] = title.strip()
+    return data
+
+def validate_fs(data):
+    """Validate a final summary, requiring every key the scorecard renders."""
+    if not isinstance(data, dict):
+        raise ValueError("Response must be a JSON object.")
+    for key in FS_SCHEMA["required"]:
+        if not isinstance(data.get(key), str):
+            raise ValueError(f'"{key}" must be a string.')
+    return data
+
+def _call_generative_model(prompt, schema=None, validator=None):
+    try:
+        generation_config = {"response_mime_type": "application/json"}
+        if schema:
+            generation_config["response_schema"] = schema
+        model = _get_genai().GenerativeModel(MODEL_NAME, generation_config=generation_config)
+        response = model.generate_content(prompt)
+
+        attempt = 0
+        while True:
+            try:
+                data = _parse_json_text(response.text)
+                return validator(data) if validator else data
+            except ValueError as e:
+                if attempt >= MAX_REPAIR_ATTEMPTS:
+                    raise
+                attempt += 1
+                print(f"Repairing invalid AI response: {e}")
+                response = model.generate_content(f"""
+    {prompt}
+
+    Your previous response was rejected because: {e}
+    Previous response:
+    {response.text}
+
+    Return a corrected version that fixes only this problem. Your response must be only the valid JSON object.
+    """)
 
     except Exception as e:
         print(f"Error calling Generative AI Model: {e}")
         return {"error": "Failed to generate scenario from AI model."}
 
-def generate_mcq(name, age, date, balance, income, life_events, specifier="N/A"):
+RECENT_EVENT_LIMIT = 8
+SUMMARY_ITEM_LIMIT = 5
+
+def new_life_summary():
+    return {"folded": 0, "decisions": 0, "careers": [], "milestones": []}
+
+def fold_life_events(life_events, summary, keep=RECENT_EVENT_LIMIT):
+    """Fold every event older than the last `keep` into `summary` in place.
+
+    Only events that have not been folded yet are visited, so the cost per
+    call is proportional to the number of new events, not the whole history.
+    """
+    cutoff = max(len(life_events) - keep, 0)
+    for event in life_events[summary["folded"]:cutoff]:
+        if event.startswith("Became a "):
+            summary["careers"].append(event[len("Became a "):])
+            del summary["careers"][:-SUMMARY_ITEM_LIMIT]
+        else:
+            summary["decisions"] += 1
+            if len(summary["milestones"]) < SUMMARY_ITEM_LIMIT:
+                summary["milestones"].append(event)
+    summary["folded"] = max(summary["folded"], cutoff)
+    return summary
+
+def format_life_events(life_events, summary=None, keep=RECENT_EVENT_LIMIT):
+    """Render life events for a prompt as a folded summary plus the last `keep` events verbatim."""
+    if not life_events:
+        return 'None'
+    if summary is None:
+        summary = new_life_summary()
+    fold_life_events(life_events, summary, keep)
+
+    recent = life_events[summary["folded"]:]
+    if not summary["folded"]:
+        return str(recent)
+
+    earlier = f"{summary['decisions']} earlier financial decisions"
+    if summary["milestones"]:
+        earlier += f" (first ones: {', '.join(summary['milestones'])})"
+    if summary["careers"]:
+        earlier += f"; past jobs: {' -> '.join(summary['careers'])}"
+    return f"Earlier life: {earlier}. Most recent events: {recent}"
+
+def build_mcq_prompt(name, age, date, balance, income, life_events, specifier="N/A", life_summary=None):
     prompt = f"""
     You are a creative writer for a life simulation game called "FinLife".
     
@@ -33,7 +268,7 @@ def generate_mcq(name, age, date, balance, income, life_events, specifier="N/A")
     Age: {age}
     Current Checking Balance: ${balance:,.2f}
     Yearly Income: ${income:,.2f}
-    Notable Past Life Events: {life_events if life_events else 'None'}
+    Notable Past Life Events: {format_life_events(life_events, life_summary)}
     --------------------
 
     The scenario must have three distinct choices. For each choice, you must provide:
@@ -67,9 +302,13 @@ def generate_mcq(name, age, date, balance, income, life_events, specifier="N/A")
     Now, based on the provided Player Context, generate a new, unique scenario. Your response must be only the valid JSON object, with no other text or markdown formatting.
     """
 
-    return _call_generative_model(prompt)
+    return prompt
+
+def generate_mcq(name, age, date, balance, income, life_events, specifier="N/A", life_summary=None):
+    prompt = build_mcq_prompt(name, age, date, balance, income, life_events, specifier, life_summary)
+    return _call_generative_model(prompt, MCQ_SCHEMA, validate_mcq)
 
-def generate_jo(name, age, income, title, life_events):
+def build_jo_prompt(name, age, income, title, life_events, life_summary=None):
     prompt = f"""
     You are a creative writer for a life simulation game called "FinLife".
     
@@ -81,7 +320,7 @@ def generate_jo(name, age, income, title, life_events):
     Age: {age}
     Current Annual Income: ${income:,.2f}
     Current Job Title: {title}
-    Notable Past Life Events: {life_events if life_events else 'None'}
+    Notable Past Life Events: {format_life_events(life_events, life_summary)}
     --------------------
 
     The scenario must provide two choices: accept the offer or decline it.
@@ -109,7 +348,11 @@ def generate_jo(name, age, income, title, life_events):
     Now, based on the provided Player Context, generate a new, unique job scenario. Your response must be only the valid JSON object, with no other text or markdown formatting.
     """
 
-    return _call_generative_model(prompt)
+    return prompt
+
+def generate_jo(name, age, income, title, life_events, life_summary=None):
+    prompt = build_jo_prompt(name, age, income, title, life_events, life_summary)
+    return _call_generative_model(prompt, JO_SCHEMA, validate_jo)
 
 def generate_fs(name, balance, income, life_events, history):
     simplified_history = [
@@ -140,4 +383,4 @@ def generate_fs(name, balance, income, life_events, history):
     Your response must be only a valid JSON object with the keys: "persona_title", "summary", "best_decision", and "worst_decision".
     """
 
-    return _call_generative_model(prompt)
\ No newline at end of file
+    return _call_generative_model(prompt, FS_SCHEMA, validate_fs)
\ No newline at end of file
@@ -1,13 +1,21 @@
 import os
 import requests
-from dotenv import load_dotenv
 
-load_dotenv()
-API_KEY = os.getenv("CAPITAL_ONE_API_KEY")
 BASE_URL = "http://api.nessieisreal.com"
 
+_api_key = None
+
+def _get_api_key():
+    global _api_key
+    if _api_key is None:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _api_key = os.getenv("CAPITAL_ONE_API_KEY")
+    return _api_key
+
 def create_customer(first_name, last_name):
-    url = f"{BASE_URL}/customers?key={API_KEY}"
+    url = f"{BASE_URL}/customers?key={_get_api_key()}"
     payload = {
         "first_name": first_name,
         "last_name": last_name,
@@ -18,46 +26,53 @@ def create_customer(first_name, last_name):
     return response.json()["objectCreated"]["_id"]
 
 def create_account(customer_id, balance):
-    url = f"{BASE_URL}/customers/{customer_id}/accounts?key={API_KEY}"
+    url = f"{BASE_URL}/customers/{customer_id}/accounts?key={_get_api_key()}"
     payload = {"type": "Checking", "nickname": "checking", "balance": balance, "rewards": 0}
     response = requests.post(url, json=payload)
     response.raise_for_status()
     return response.json()["objectCreated"]["_id"]
 
 def make_deposit(account_id, date, amount, description):
-    url = f"{BASE_URL}/accounts/{account_id}/deposits?key={API_KEY}"
+    url = f"{BASE_URL}/accounts/{account_id}/deposits?key={_get_api_key()}"
     payload = {"medium": "balance", "transaction_date": date, "amount": amount, "description": description}
     response = requests.post(url, json=payload)
     response.raise_for_status()
 
 def make_withdrawal(account_id, date, amount, description):
-    url = f"{BASE_URL}/accounts/{account_id}/withdrawals?key={API_KEY}"
+    url = f"{BASE_URL}/accounts/{account_id}/withdrawals?key={_get_api_key()}"
     payload = {"medium": "balance", "transaction_date": date, "amount": amount, "description": description}
     response = requests.post(url, json=payload)
     response.raise_for_status()
 
 def get_account_balance(account_id):
-    url = f"{BASE_URL}/accounts/{account_id}?key={API_KEY}"
+    url = f"{BASE_URL}/accounts/{account_id}?key={_get_api_key()}"
     response = requests.get(url)
     response.raise_for_status()
     return response.json()["balance"]
 
-def get_all_transactions_for_account(account_id):
-    try:
-        deposits_url = f"{BASE_URL}/accounts/{account_id}/deposits?key={API_KEY}"
-        withdrawals_url = f"{BASE_URL}/accounts/{account_id}/withdrawals?key={API_KEY}"
+def fetch_all_transactions_for_account(account_id):
+    deposits_url = f"{BASE_URL}/accounts/{account_id}/deposits?key={_get_api_key()}"
+    withdrawals_url = f"{BASE_URL}/accounts/{account_id}/withdrawals?key={_get_api_key()}"
+
+    deposits_response = requests.get(deposits_url)
+    deposits_response.raise_for_status()
+    withdrawals_response = requests.get(withdrawals_url)
+    withdrawals_response.raise_for_status()
+    deposits = deposits_response.json()
+    withdrawals = withdrawals_response.json()
 
-        deposits = requests.get(deposits_url).json()
-        withdrawals = requests.get(withdrawals_url).json()
+    for d in deposits: d['type'] = 'deposit'
+    for w in withdrawals: w['type'] = 'withdrawal'
 
-        for d in deposits: d['type'] = 'deposit'
-        for w in withdrawals: w['type'] = 'withdrawal'
+    all_events = deposits + withdrawals
+    all_events = [t for t in all_events if t.get('transaction_date')]
+    all_events.sort(key=lambda x: x['transaction_date'], reverse=True)
 
-        all_events = deposits + withdrawals
-        all_events = [t for t in all_events if t.get('transaction_date')]
-        all_events.sort(key=lambda x: x['transaction_date'], reverse=True)
+    return all_events
 
-        return all_events
+def get_all_transactions_for_account(account_id):
+    try:
+        return fetch_all_transactions_for_account(account_id)
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching financial history for account {account_id}: {e}")
@@ -1,48 +1,135 @@
 import uuid
+import bisect
+import hashlib
+import threading
+import time
+import mimetypes
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 import api_client
 import ai_agent
+import static_assets
+import event_log
 
-app = Flask(__name__)
-CORS(app)
+app = Flask(__name__, static_folder=None)
+CORS(app, expose_headers=["ETag"])
 
 PORT = 5000
+IMMUTABLE_MAX_AGE = 31536000
+BULK_MAX_PLAYERS = 200
+BULK_MAX_WORKERS = 8
+ACCOUNT_POOL_LIMIT = 200
+FINISHED_TURN_TTL = 600
+FINISHED_TURN_LIMIT = 1000
+TURN_KEY_TTL = 600
+TURN_KEY_LIMIT = 64
 START_BALANCE = 10000
 START_AGE = 16
 END_AGE = 67
 
 game_sessions = {}
+history_index = {}
+turn_results = {}
+turn_locks = {}
+finished_turns = OrderedDict()
+finished_turns_lock = threading.Lock()
+# Pre-warmed pairs live only in memory; any left unclaimed are orphaned in Nessie on restart.
+account_pool = deque()
+account_pool_lock = threading.Lock()
+account_pool_pending = 0
+
+def _log_event(event_type, game_id, data, session=None, life_event=None, game_over=False):
+    try:
+        if event_log.append(event_type, game_id, data, session, life_event, game_over):
+            event_log.write_snapshot()
+    except OSError as e:
+        print(f"Error writing event log: {e}")
+
+def _response_state(session):
+    """Copy the session for a playerState payload, leaving out internal prompt-building state."""
+    response_state = {k: v for k, v in session.items() if k != "life_summary"}
+    response_state["currentDate"] = response_state["currentDate"].isoformat()
+    return response_state
+
+def _history_entry(game_id):
+    return history_index.setdefault(game_id, {
+        "version": 0, "stale": True, "transactions": [], "dates": [], "ids": set(), "lock": threading.Lock()
+    })
+
+def _mark_history_changed(game_id):
+    entry = _history_entry(game_id)
+    with entry["lock"]:
+        entry["version"] += 1
+        entry["stale"] = True
+
+def _get_history_index(game_id, account_id):
+    """Return the game's transactions in ascending date order, refetching from Nessie only after a change.
+
+    New transactions are always dated on or after the latest known one, so they are
+    appended rather than re-sorted, which keeps list positions stable for use as cursors.
+    """
+    entry = _history_entry(game_id)
+    with entry["lock"]:
+        # Held across the fetch so concurrent refreshes cannot append the same transactions
+        # twice; a failed fetch raises and leaves the entry stale for the next request.
+        if entry["stale"]:
+            fetched = api_client.fetch_all_transactions_for_account(account_id)
+            new = [t for t in reversed(fetched) if t.get("_id") not in entry["ids"]]
+            new.sort(key=lambda t: t["transaction_date"])
+            for t in new:
+                entry["transactions"].append(t)
+                entry["dates"].append(t["transaction_date"])
+                entry["ids"].add(t.get("_id"))
+            entry["stale"] = False
+    return entry
+
+def _valid_names(*names):
+    # Checked before an account is claimed or created, so a bad name never orphans one in Nessie.
+    return all(isinstance(name, str) and name.strip() for name in names)
+
+def _claim_account(first_name, last_name):
+    """Take a pre-warmed customer/account pair if one is ready, otherwise create one in Nessie."""
+    try:
+        return account_pool.popleft()
+    except IndexError:
+        customer_id = api_client.create_customer(first_name, last_name)
+        return customer_id, api_client.create_account(customer_id, START_BALANCE)
+
+def _create_session(first_name, last_name):
+    customer_id, account_id = _claim_account(first_name, last_name)
+
+    game_id = str(uuid.uuid4())
+    game_sessions[game_id] = {
+        "name": first_name + " " + last_name,
+        "customerId": customer_id,
+        "accountId": account_id,
+        "age": START_AGE,
+        "currentDate": date(date.today().year, 1, 1),
+        "balance": START_BALANCE,
+        "income": 0,
+        "jobTitle": "Unemployed",
+        "life_events": [],
+        "life_summary": ai_agent.new_life_summary(),
+        "started": False
+    }
+    _log_event("start", game_id, {"firstName": first_name, "lastName": last_name}, game_sessions[game_id])
+    return game_id
 
 @app.route('/game/start', methods=['POST'])
 def start_game():
     data = request.json
     first_name = data.get("firstName")
     last_name = data.get("lastName")
-    if not first_name or not last_name:
-        return jsonify({"error": "firstName and lastName are required."}), 400
+    if not _valid_names(first_name, last_name):
+        return jsonify({"error": "firstName and lastName must be non-empty strings."}), 400
 
     try:
-        customer_id = api_client.create_customer(first_name, last_name)
-        account_id = api_client.create_account(customer_id, START_BALANCE)
-
-        game_id = str(uuid.uuid4())
-        game_sessions[game_id] = {
-            "name": first_name + " " + last_name,
-            "customerId": customer_id,
-            "accountId": account_id,
-            "age": START_AGE,
-            "currentDate": date(date.today().year, 1, 1),
-            "balance": START_BALANCE,
-            "income": 0,
-            "jobTitle": "Unemployed",
-            "life_events": [],
-            "started": False
-        }
+        game_id = _create_session(first_name, last_name)
 
-        response_state = game_sessions[game_id].copy()
-        response_state["currentDate"] = response_state["currentDate"].isoformat()
+        response_state = _response_state(game_sessions[game_id])
 
         return jsonify({
             "gameId": game_id,
@@ -54,6 +141,87 @@ def start_game():
         print(f"Error starting game: {e}")
         return jsonify({"error": "Failed to start game due to an internal server error."}), 500
 
+@app.route('/game/start-bulk', methods=['POST'])
+def start_games_bulk():
+    """Start a game for every player in a class, provisioning Nessie accounts concurrently.
+
+    Players are started independently, so one failure only shows up as an error in
+    that player's result entry.
+    """
+    data = request.json
+    players = data.get("players")
+    if not isinstance(players, list) or not players or len(players) > BULK_MAX_PLAYERS:
+        return jsonify({"error": f"players must be a list of 1 to {BULK_MAX_PLAYERS} entries."}), 400
+
+    def start_one(indexed_player):
+        index, player = indexed_player
+        result = {"index": index}
+        first_name = player.get("firstName") if isinstance(player, dict) else None
+        last_name = player.get("lastName") if isinstance(player, dict) else None
+        if not _valid_names(first_name, last_name):
+            result["error"] = "firstName and lastName must be non-empty strings."
+            return result
+        result.update({"firstName": first_name, "lastName": last_name})
+        try:
+            result["gameId"] = _create_session(first_name, last_name)
+        except Exception as e:
+            print(f"Error starting game for player {index}: {e}")
+            result["error"] = "Failed to start game due to an internal server error."
+        return result
+
+    with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, len(players))) as pool:
+        results = list(pool.map(start_one, enumerate(players)))
+
+    started = sum(1 for r in results if "gameId" in r)
+    return jsonify({
+        "message": f"Started {started} of {len(players)} games.",
+        "started": started,
+        "failed": len(players) - started,
+        "games": results
+    })
+
+@app.route('/game/prewarm', methods=['POST'])
+def prewarm_accounts():
+    """Create ready-to-use customer/account pairs so later starts skip the Nessie round-trips.
+
+    The pool never grows past ACCOUNT_POOL_LIMIT, counting pairs still being created by
+    concurrent calls; the rest of the requested count is reported as skipped.
+    """
+    global account_pool_pending
+    data = request.json
+    count = data.get("count")
+    if isinstance(count, bool) or not isinstance(count, int) or count <= 0 or count > BULK_MAX_PLAYERS:
+        return jsonify({"error": f"count must be a number between 1 and {BULK_MAX_PLAYERS}."}), 400
+
+    with account_pool_lock:
+        to_create = max(0, min(count, ACCOUNT_POOL_LIMIT - len(account_pool) - account_pool_pending))
+        account_pool_pending += to_create
+
+    def create_pair(_):
+        try:
+            customer_id = api_client.create_customer("FinLife", "Player")
+            account_pool.append((customer_id, api_client.create_account(customer_id, START_BALANCE)))
+            return True
+        except Exception as e:
+            print(f"Error pre-warming account: {e}")
+            return False
+
+    created = 0
+    try:
+        if to_create:
+            with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, to_create)) as pool:
+                created = sum(pool.map(create_pair, range(to_create)))
+    finally:
+        with account_pool_lock:
+            account_pool_pending -= to_create
+
+    return jsonify({
+        "created": created,
+        "failed": to_create - created,
+        "skipped": count - to_create,
+        "poolSize": len(account_pool)
+    })
+
 @app.route('/game/state', methods=['POST'])
 def get_game_state():
     data = request.json
@@ -62,114 +230,194 @@ def get_game_state():
     if not session:
         return jsonify({"error": "Game session not found."}), 404
 
-    response_state = session.copy()
-    response_state["currentDate"] = response_state["currentDate"].isoformat()
+    response_state = _response_state(session)
     return jsonify({"playerState": response_state})
 
-@app.route('/game/advance-year', methods=['POST'])
-def advance_year():
-    data = request.json
-    game_id = data.get("gameId")
-    session = game_sessions.get(game_id)
-    if not session:
-        return jsonify({"error": "Game session not found."}), 404
+def _advance_year(game_id, session, progress=None):
+    """Advance the session by one year and return the response payload.
 
-    try:
+    Each step that changes the session or posts to Nessie is recorded in `progress`,
+    so calling again with the same dict after a failure resumes instead of repeating them.
+    """
+    if progress is None:
+        progress = {}
+
+    if not progress.get("aged"):
         if session["started"]:
             session["age"] += 1
             session["currentDate"] += timedelta(days=365)
         session["started"] = True
-        sim_date = session["currentDate"].isoformat()
-
-        if session["income"] > 0:
-            api_client.make_deposit(session["accountId"], sim_date, session["income"], session["jobTitle"] + " Annual Salary")
-        if session["age"] >= 18:
-            annual_expenses = -45 * pow(session["age"], 2) + 4000 * session["age"] - 30000
-            api_client.make_withdrawal(session["accountId"], sim_date, annual_expenses, "Annual Living Expenses")
-
-        session["balance"] = api_client.get_account_balance(session["accountId"])
-
-        if session["age"] >= 67:
-            transaction_history = api_client.get_all_transactions_for_account(session["accountId"])
-            final_summary = ai_agent.generate_fs(session["name"], session["balance"], session["income"], session["life_events"], transaction_history)
-
-            response_state = session.copy()
-            response_state["currentDate"] = response_state["currentDate"].isoformat()
-
-            del game_sessions[game_id]
-
-            return jsonify({
-                "gameOver": True,
-                "message": "You've reached the retirement age of 67. Your financial journey is complete!",
-                "playerState": response_state,
-                "finalSummary": final_summary
-            })
-
-        event_type = "mcq"
-        specifier = "N/A"
-
-        age = session["age"]
-        if age == 18:
-            specifier = "paying the entire 4-year tuition of a private university"
-        elif age == 21:
-            specifier = "paying for a car"
-        elif age == 38:
-            specifier = "paying for a house"
-        elif (age < 30 and age % 3 == 1) or (age >= 30 and age % 5 == 0):
-            event_type = "job"
+        progress["aged"] = True
+    sim_date = session["currentDate"].isoformat()
+
+    if session["income"] > 0 and not progress.get("salaryPosted"):
+        api_client.make_deposit(session["accountId"], sim_date, session["income"], session["jobTitle"] + " Annual Salary")
+        progress["salaryPosted"] = True
+        _mark_history_changed(game_id)
+    if session["age"] >= 18 and not progress.get("expensesPosted"):
+        annual_expenses = -45 * pow(session["age"], 2) + 4000 * session["age"] - 30000
+        api_client.make_withdrawal(session["accountId"], sim_date, annual_expenses, "Annual Living Expenses")
+        progress["expensesPosted"] = True
+        _mark_history_changed(game_id)
+
+    session["balance"] = api_client.get_account_balance(session["accountId"])
+
+    if session["age"] >= 67:
+        transaction_history = api_client.get_all_transactions_for_account(session["accountId"])
+        final_summary = ai_agent.generate_fs(session["name"], session["balance"], session["income"], session["life_events"], transaction_history)
+
+        response_state = _response_state(session)
+
+        del game_sessions[game_id]
+        history_index.pop(game_id, None)
+        turn_results.pop(game_id, None)
+        turn_locks.pop(game_id, None)
+
+        return {
+            "gameOver": True,
+            "message": "You've reached the retirement age of 67. Your financial journey is complete!",
+            "playerState": response_state,
+            "finalSummary": final_summary
+        }
 
-        if event_type == "job":
-            scenario = ai_agent.generate_jo(
-                session["name"], session["age"], session["income"],
-                session["jobTitle"], session["life_events"]
-            )
+    event_type = "mcq"
+    specifier = "N/A"
+
+    age = session["age"]
+    if age == 18:
+        specifier = "paying the entire 4-year tuition of a private university"
+    elif age == 21:
+        specifier = "paying for a car"
+    elif age == 38:
+        specifier = "paying for a house"
+    elif (age < 30 and age % 3 == 1) or (age >= 30 and age % 5 == 0):
+        event_type = "job"
+
+    if event_type == "job":
+        scenario = ai_agent.generate_jo(
+            session["name"], session["age"], session["income"],
+            session["jobTitle"], session["life_events"],
+            life_summary=session["life_summary"]
+        )
+    else:
+        scenario = ai_agent.generate_mcq(
+            session["name"], session["age"], sim_date, session["balance"],
+            session["income"],
+            session["life_events"], specifier,
+            life_summary=session["life_summary"]
+        )
+
+    response_state = _response_state(session)
+
+    return {
+        "message": f"You are now {age} years old.",
+        "playerState": response_state,
+        "nextEvent": scenario
+    }
+
+def _apply_mcq_choice(game_id, session, choice):
+    impact = choice["financial_impact"]
+    action = impact["action"]
+    amount = impact["amount"]
+    description = impact["description"]
+    sim_date = session["currentDate"].isoformat()
+
+    if amount != 0:
+        if action == "WITHDRAWAL":
+            api_client.make_withdrawal(session["accountId"], sim_date, amount, description)
         else:
-            scenario = ai_agent.generate_mcq(
-                session["name"], session["age"], sim_date, session["balance"],
-                session["income"],
-                session["life_events"], specifier
-            )
+            api_client.make_deposit(session["accountId"], sim_date, amount, description)
+        _mark_history_changed(game_id)
+
+    session["life_events"].append(description)
+
+def _apply_job_choice(session, choice):
+    impact = choice["financial_impact"]
+    session["income"] = impact["income"]
+    session["jobTitle"] = impact["title"]
+    session["life_events"].append(f"Became a {impact['title']}")
+    return impact["title"]
+
+def _finished_turn(game_id):
+    now = time.time()
+    with finished_turns_lock:
+        while finished_turns and (
+            len(finished_turns) > FINISHED_TURN_LIMIT
+            or next(iter(finished_turns.values()))[0] < now - FINISHED_TURN_TTL
+        ):
+            finished_turns.popitem(last=False)
+        entry = finished_turns.get(game_id)
+    return entry[1] if entry else None
+
+def _expire_turn_keys(turns):
+    """Drop old turn records, always keeping the latest so an unfinished turn can still resume."""
+    cutoff = time.time() - TURN_KEY_TTL
+    while len(turns) > 1 and (len(turns) > TURN_KEY_LIMIT or next(iter(turns.values()))["at"] < cutoff):
+        turns.popitem(last=False)
+
+def _abandon_unfinished_turns(game_id):
+    """Stop an unfinished turn from resuming once something else has moved the game on."""
+    for turn in turn_results.get(game_id, {}).values():
+        if not turn["response"]:
+            turn["abandoned"] = True
+
+def _lock_session(game_id):
+    """Look up the session and take its turn lock without waiting.
+
+    Returns (session, lock, None), or (None, None, error_response) when the game does
+    not exist or another request for it is in progress. No lock is created for an
+    unknown game.
+    """
+    if game_id not in game_sessions:
+        return None, None, (jsonify({"error": "Game session not found."}), 404)
+    lock = turn_locks.setdefault(game_id, threading.Lock())
+    if not lock.acquire(blocking=False):
+        return None, None, (jsonify({"error": "Another request for this game is already in progress."}), 409)
+    session = game_sessions.get(game_id)
+    if not session:
+        # The game ended between the lookup and the acquire; drop the lock recreated for it.
+        turn_locks.pop(game_id, None)
+        lock.release()
+        return None, None, (jsonify({"error": "Game session not found."}), 404)
+    return session, lock, None
 
-        response_state = session.copy()
-        response_state["currentDate"] = response_state["currentDate"].isoformat()
+@app.route('/game/advance-year', methods=['POST'])
+def advance_year():
+    data = request.json
+    game_id = data.get("gameId")
+    session, lock, error = _lock_session(game_id)
+    if error:
+        return error
 
-        return jsonify({
-            "message": f"You are now {age} years old.",
-            "playerState": response_state,
-            "nextEvent": scenario
-        })
+    try:
+        _abandon_unfinished_turns(game_id)
+        payload = _advance_year(game_id, session)
+        _log_event("advance", game_id, {}, session, game_over=payload.get("gameOver", False))
+        return jsonify(payload)
 
     except Exception as e:
         print(f"Error advancing year: {e}")
         return jsonify({"error": "Failed to advance to the next year."}), 500
 
+    finally:
+        lock.release()
+
 @app.route('/decision/mcq', methods=['POST'])
 def make_mcq_decision():
     data = request.json
     game_id = data.get("gameId")
     choice = data.get("choice")
-    session = game_sessions.get(game_id)
-    if not session:
-        return jsonify({"error": "Game session not found."}), 404
+    session, lock, error = _lock_session(game_id)
+    if error:
+        return error
 
     try:
-        impact = choice["financial_impact"]
-        action = impact["action"]
-        amount = impact["amount"]
-        description = impact["description"]
-        sim_date = session["currentDate"].isoformat()
-
-        if amount != 0:
-            if action == "WITHDRAWAL":
-                api_client.make_withdrawal(session["accountId"], sim_date, amount, description)
-            else:
-                api_client.make_deposit(session["accountId"], sim_date, amount, description)
-
+        _abandon_unfinished_turns(game_id)
+        _apply_mcq_choice(game_id, session, choice)
         session["balance"] = api_client.get_account_balance(session["accountId"])
-        session["life_events"].append(description)
+        _log_event("decision_mcq", game_id, {"choice": choice}, session, life_event=session["life_events"][-1])
 
-        response_state = session.copy()
-        response_state["currentDate"] = response_state["currentDate"].isoformat()
+        response_state = _response_state(session)
 
         return jsonify({
             "message": "Decision processed.",
@@ -180,26 +428,27 @@ def make_mcq_decision():
         print(f"Error making MCQ decision: {e}")
         return jsonify({"error": "Failed to process decision."}), 500
 
+    finally:
+        lock.release()
+
 @app.route('/decision/job', methods=['POST'])
 def make_job_decision():
     data = request.json
     game_id = data.get("gameId")
     choice = data.get("choice")
-    session = game_sessions.get(game_id)
-    if not session:
-        return jsonify({"error": "Game session not found."}), 404
+    session, lock, error = _lock_session(game_id)
+    if error:
+        return error
 
     try:
-        impact = choice["financial_impact"]
-        session["income"] = impact["income"]
-        session["jobTitle"] = impact["title"]
-        session["life_events"].append(f"Became a {impact['title']}")
+        _abandon_unfinished_turns(game_id)
+        title = _apply_job_choice(session, choice)
+        _log_event("decision_job", game_id, {"choice": choice}, session, life_event=session["life_events"][-1])
 
-        response_state = session.copy()
-        response_state["currentDate"] = response_state["currentDate"].isoformat()
+        response_state = _response_state(session)
 
         return jsonify({
-            "message": f"Congratulations on your new role as a {impact['title']}!",
+            "message": f"Congratulations on your new role as a {title}!",
             "playerState": response_state
         })
 
@@ -207,21 +456,100 @@ def make_job_decision():
         print(f"Error making Job decision: {e}")
         return jsonify({"error": "Failed to process job decision."}), 500
 
+    finally:
+        lock.release()
+
+@app.route('/game/turn', methods=['POST'])
+def take_turn():
+    """Apply a choice, advance a year and return the next event plus the history delta.
+
+    Turns for a game run one at a time; a request arriving while another is in progress
+    gets a 409. Each game remembers its recent idempotency keys, so a retry or a late
+    duplicate of a finished turn returns the stored response, and a retry after a
+    partial failure resumes without re-posting anything. An unfinished turn is abandoned
+    once a new key or another game action arrives; its key then gets a 410.
+    """
+    data = request.json
+    game_id = data.get("gameId")
+    choice = data.get("choice")
+    key = data.get("idempotencyKey")
+    since = data.get("since", 0)
+    if not isinstance(key, str) or not key:
+        return jsonify({"error": "idempotencyKey must be a non-empty string."}), 400
+    if not isinstance(since, int) or since < 0:
+        return jsonify({"error": "since must be a non-negative integer."}), 400
+
+    # Final responses outlive the session for a while so a retry after game over still gets them.
+    turn = _finished_turn(game_id)
+    if turn and turn["key"] == key:
+        return jsonify(turn["response"])
+
+    session, lock, error = _lock_session(game_id)
+    if error:
+        return error
+
+    try:
+        turns = turn_results.setdefault(game_id, OrderedDict())
+        _expire_turn_keys(turns)
+        turn = turns.get(key)
+        if turn is None:
+            _abandon_unfinished_turns(game_id)
+            turn = turns[key] = {
+                "key": key, "choiceApplied": False, "lifeEvent": None, "progress": {}, "response": None,
+                "abandoned": False, "at": time.time()
+            }
+        elif turn["abandoned"]:
+            return jsonify({"error": "This turn was abandoned for a later one and cannot be resumed."}), 410
+
+        if choice and not turn["choiceApplied"]:
+            if "action" in choice["financial_impact"]:
+                _apply_mcq_choice(game_id, session, choice)
+            else:
+                _apply_job_choice(session, choice)
+            turn["choiceApplied"] = True
+            turn["lifeEvent"] = session["life_events"][-1]
+
+        if not turn["response"]:
+            payload = _advance_year(game_id, session, turn["progress"])
+            _log_event("turn", game_id, {"choice": choice, "idempotencyKey": key}, session,
+                       life_event=turn["lifeEvent"], game_over=payload.get("gameOver", False))
+            turn["response"] = payload
+            turn["at"] = time.time()
+            if payload.get("gameOver"):
+                with finished_turns_lock:
+                    finished_turns[game_id] = (time.time(), turn)
+                return jsonify(payload)
+
+        # The delta is built per request, so a retry with an older cursor still gets every transaction.
+        entry = _get_history_index(game_id, session["accountId"])
+        payload = dict(turn["response"])
+        payload["transaction_history"] = entry["transactions"][since:][::-1]
+        payload["cursor"] = max(len(entry["transactions"]), since)
+        return jsonify(payload)
+
+    except Exception as e:
+        print(f"Error taking turn: {e}")
+        return jsonify({"error": "Failed to process turn."}), 500
+
+    finally:
+        lock.release()
+
 @app.route('/game/fast-forward', methods=['POST'])
 def fast_forward():
     data = request.json
     game_id = data.get("gameId")
     target_age = data.get("targetAge")
-    session = game_sessions.get(game_id)
-    if not session:
-        return jsonify({"error": "Game session not found."}), 404
+    session, lock, error = _lock_session(game_id)
+    if error:
+        return error
 
-    current_age = session["age"]
+    try:
+        current_age = session["age"]
 
-    if not isinstance(target_age, int) or target_age <= current_age or target_age > END_AGE:
-        return jsonify({"error": f"Invalid target age. Must be a number between {current_age + 1} and {END_AGE}."}), 400
+        if not isinstance(target_age, int) or target_age <= current_age or target_age > END_AGE:
+            return jsonify({"error": f"Invalid target age. Must be a number between {current_age + 1} and {END_AGE}."}), 400
 
-    try:
+        _abandon_unfinished_turns(game_id)
         while session["age"] < target_age:
             session["age"] += 1
             session["currentDate"] += timedelta(days=365)
@@ -232,6 +560,7 @@ def fast_forward():
         if session["age"] >= 18:
             annual_expenses = -45 * pow(session["age"], 2) + 4000 * session["age"] - 30000
             api_client.make_withdrawal(session["accountId"], sim_date, annual_expenses, "Annual Living Expenses")
+        _mark_history_changed(game_id)
 
         session["balance"] = api_client.get_account_balance(session["accountId"])
 
@@ -239,10 +568,13 @@ def fast_forward():
             transaction_history = api_client.get_all_transactions_for_account(session["accountId"])
             final_summary = ai_agent.generate_fs(session["name"], session["balance"], session["income"], session["life_events"], transaction_history)
 
-            response_state = session.copy()
-            response_state["currentDate"] = response_state["currentDate"].isoformat()
+            response_state = _response_state(session)
 
             del game_sessions[game_id]
+            history_index.pop(game_id, None)
+            turn_results.pop(game_id, None)
+            turn_locks.pop(game_id, None)
+            _log_event("fast_forward", game_id, {"targetAge": target_age}, game_over=True)
 
             return jsonify({
                 "gameOver": True,
@@ -267,17 +599,20 @@ def fast_forward():
         if event_type == "job":
             scenario = ai_agent.generate_jo(
                 session["name"], session["age"], session["income"],
-                session["jobTitle"], session["life_events"]
+                session["jobTitle"], session["life_events"],
+                life_summary=session["life_summary"]
             )
         else:
             scenario = ai_agent.generate_mcq(
                 session["name"], session["age"], sim_date, session["balance"],
                 session["income"],
-                session["life_events"], specifier
+                session["life_events"], specifier,
+                life_summary=session["life_summary"]
             )
 
-        response_state = session.copy()
-        response_state["currentDate"] = response_state["currentDate"].isoformat()
+        _log_event("fast_forward", game_id, {"targetAge": target_age}, session)
+
+        response_state = _response_state(session)
 
         return jsonify({
             "message": f"You are now {age} years old.",
@@ -289,21 +624,111 @@ def fast_forward():
         print(f"Error during fast forward: {e}")
         return jsonify({"error": "Failed to fast forward."}), 500
 
+    finally:
+        lock.release()
+
+def _is_iso_date(value):
+    # Ledger dates are compared as strings, so only the exact YYYY-MM-DD form is accepted.
+    try:
+        return date.fromisoformat(value).isoformat() == value
+    except (TypeError, ValueError):
+        return False
+
 @app.route('/game/history', methods=['POST'])
 def get_history():
     data = request.json
     game_id = data.get("gameId")
+    since = data.get("since", 0)
+    limit = data.get("limit")
+    since_date = data.get("sinceDate")
     session = game_sessions.get(game_id)
     if not session:
         return jsonify({"error": "Game session not found."}), 404
 
+    if not isinstance(since, int) or since < 0 or (limit is not None and (not isinstance(limit, int) or limit <= 0)):
+        return jsonify({"error": "since must be a non-negative integer and limit a positive integer."}), 400
+    if since_date is not None and not _is_iso_date(since_date):
+        return jsonify({"error": "sinceDate must be an ISO date string (YYYY-MM-DD)."}), 400
+
     try:
-        history = api_client.get_all_transactions_for_account(session["accountId"])
-        return jsonify({"transaction_history": history})
+        entry = _get_history_index(game_id, session["accountId"])
+        # The ETag names the ledger version. It only short-circuits a poll from the end of
+        # the ledger, where an unchanged version means there is nothing new to send; pages
+        # before the end are always served in full.
+        total = len(entry["transactions"])
+        etag = hashlib.sha1(f"{game_id}:{entry['version']}:{total}".encode()).hexdigest()
+        if since >= total and request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        start = since
+        if since_date:
+            start = max(start, bisect.bisect_left(entry["dates"], since_date))
+        end = total if limit is None else min(start + limit, total)
+        page = entry["transactions"][start:end]
+
+        response = jsonify({
+            "transaction_history": page[::-1],
+            "cursor": max(end, since),
+            "hasMore": end < total
+        })
+        response.set_etag(etag)
+        return response
 
     except Exception as e:
         print(f"Error fetching history: {e}")
         return jsonify({"error": "Failed to fetch transaction history."}), 500
 
+def _serve_asset(filename):
+    asset = static_assets.get_asset(filename)
+    # Prefer brotli when the client rates both encodings equally.
+    encoding = request.accept_encodings.best_match([e for e in ("br", "gzip") if e in asset["variants"]])
+    etag = asset["hash"] + (f"-{encoding}" if encoding else "")
+
+    if encoding or asset["body"] is not None:
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            body = asset["variants"][encoding] if encoding else asset["body"]
+            response = app.response_class(body, mimetype=mimetypes.guess_type(filename)[0])
+            if encoding:
+                response.content_encoding = encoding
+        response.set_etag(etag)
+    else:
+        # send_file handles If-None-Match and HTTP Range requests for the clips.
+        response = send_file(asset["path"], conditional=True, etag=etag, max_age=None)
+
+    response.vary.add("Accept-Encoding")
+    if request.args.get("v") == asset["hash"]:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+@app.route('/', methods=['GET'])
+def index():
+    return _serve_asset("index.html")
+
+@app.route('/static/manifest.json', methods=['GET'])
+def get_asset_manifest():
+    response = jsonify(static_assets.build_manifest())
+    response.cache_control.no_cache = True
+    return response
+
+@app.route('/static/<filename>', methods=['GET'])
+def get_static_asset(filename):
+    if not static_assets.is_servable(filename):
+        return jsonify({"error": "Asset not found."}), 404
+    return _serve_asset(filename)
+
+def recover_sessions():
+    """Load sessions saved in the event log. Call once at server startup, before serving requests."""
+    game_sessions.update(event_log.recover())
+
 if __name__ == '__main__':
+    recover_sessions()
     app.run(port=PORT, debug=True)
\ No newline at end of file
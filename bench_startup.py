@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark
+
+Imports each FinLife module in a fresh interpreter several times and reports the
+median wall time, plus whether the Gemini SDK was pulled in at import time.
+
+Usage examples:
+  python bench_startup.py                       # app, ai_agent and Simulation, 5 runs each
+  python bench_startup.py --runs 10 app         # Only app, 10 runs
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+MODULES = ["app", "ai_agent", "Simulation"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "genai_loaded": "google.generativeai" in sys.modules}}))
+"""
+
+
+def measure(module: str, runs: int) -> Dict[str, float]:
+    repo_root = os.path.dirname(os.path.abspath(__file__))
+    timings: List[float] = []
+    genai_loaded = False
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=repo_root, capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        genai_loaded = genai_loaded or result["genai_loaded"]
+    return {
+        "median_ms": 1000 * statistics.median(timings),
+        "min_ms": 1000 * min(timings),
+        "genai_loaded": genai_loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of FinLife modules.")
+    parser.add_argument("modules", nargs="*", default=MODULES, help="Modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+    args = parser.parse_args()
+
+    print("module\tmedian_ms\tmin_ms\tgenai_loaded")
+    for module in args.modules:
+        result = measure(module, args.runs)
+        print(f"{module}\t{result['median_ms']:.1f}\t{result['min_ms']:.1f}\t{result['genai_loaded']}")
+
+
+if __name__ == "__main__":
+    main()
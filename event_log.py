@@ -0,0 +1,173 @@
+import os
+import copy
+import json
+import threading
+from datetime import date
+
+LOG_FILENAME = "events.jsonl"
+SNAPSHOT_FILENAME = "snapshot.json"
+SNAPSHOT_INTERVAL = 100
+
+STATE_FIELDS = ["age", "currentDate", "balance", "income", "jobTitle", "started"]
+
+_lock = threading.Lock()
+_seq = 0
+_since_snapshot = 0
+# Sessions rebuilt only from logged events, so a snapshot never contains a change whose
+# event has not been appended yet.
+_logged_sessions = {}
+_log_dir = None
+
+def _get_log_dir():
+    global _log_dir
+    if _log_dir is None:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        log_dir = os.getenv("FINLIFE_EVENT_LOG_DIR", "data")
+        # A relative directory is resolved against this file, not the working directory.
+        _log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), log_dir) if log_dir else ""
+    return _log_dir
+
+def enabled():
+    return bool(_get_log_dir())
+
+def log_path():
+    return os.path.join(_get_log_dir(), LOG_FILENAME)
+
+def snapshot_path():
+    return os.path.join(_get_log_dir(), SNAPSHOT_FILENAME)
+
+def _serialize_session(session):
+    state = session.copy()
+    state["currentDate"] = state["currentDate"].isoformat()
+    return state
+
+def _deserialize_session(state):
+    session = dict(state)
+    session["currentDate"] = date.fromisoformat(session["currentDate"])
+    return session
+
+def append(event_type, game_id, data, session=None, life_event=None, game_over=False):
+    """Append one event to the log and return True when a snapshot is due.
+
+    Only the scalar session fields are recorded, plus the life event the request
+    added, so each line stays small no matter how long the game has run.
+    """
+    global _seq, _since_snapshot
+    if not enabled():
+        return False
+
+    event = {"type": event_type, "gameId": game_id, "data": data}
+    if session is not None:
+        if event_type == "start":
+            event["state"] = _serialize_session(session)
+        else:
+            event["state"] = {k: session[k] for k in STATE_FIELDS}
+            event["state"]["currentDate"] = session["currentDate"].isoformat()
+    if life_event is not None:
+        event["lifeEvent"] = life_event
+    if game_over:
+        event["gameOver"] = True
+
+    with _lock:
+        _seq += 1
+        _since_snapshot += 1
+        event["seq"] = _seq
+        line = json.dumps(event, separators=(",", ":"), default=str)
+        os.makedirs(_get_log_dir(), exist_ok=True)
+        with open(log_path(), "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        # Apply the decoded line so the logged state shares nothing with the live sessions.
+        apply_event(_logged_sessions, json.loads(line))
+        return _since_snapshot >= SNAPSHOT_INTERVAL
+
+def write_snapshot():
+    """Atomically write the logged sessions together with the log position they reflect."""
+    global _since_snapshot
+    if not enabled():
+        return
+
+    with _lock:
+        os.makedirs(_get_log_dir(), exist_ok=True)
+        offset = os.path.getsize(log_path()) if os.path.exists(log_path()) else 0
+        snapshot = {
+            "seq": _seq,
+            "offset": offset,
+            "sessions": {game_id: _serialize_session(s) for game_id, s in _logged_sessions.items()}
+        }
+        tmp_path = snapshot_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"), default=str)
+        os.replace(tmp_path, snapshot_path())
+        _since_snapshot = 0
+
+def _read_lines(path, offset):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            offset += len(line)
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("missing newline")
+                event = json.loads(line)
+            except ValueError:
+                print(f"Stopping event log replay at unreadable line in {path}.")
+                return
+            yield event, offset
+
+def read_events(path=None, offset=0):
+    """Yield logged events from `offset`, stopping at a torn final line left by a crash."""
+    path = path or log_path()
+    if not os.path.exists(path):
+        return
+    for event, _ in _read_lines(path, offset):
+        yield event
+
+def apply_event(sessions, event):
+    game_id = event["gameId"]
+    if event.get("gameOver"):
+        sessions.pop(game_id, None)
+        return
+    if event["type"] == "start":
+        sessions[game_id] = _deserialize_session(event["state"])
+        return
+
+    session = sessions.get(game_id)
+    if session is None:
+        return
+    if "state" in event:
+        state = dict(event["state"])
+        state["currentDate"] = date.fromisoformat(state["currentDate"])
+        session.update(state)
+    if "lifeEvent" in event:
+        session["life_events"].append(event["lifeEvent"])
+
+def recover():
+    """Rebuild the live sessions from the latest snapshot plus the events logged after it."""
+    global _seq, _logged_sessions
+    sessions = {}
+    if not enabled():
+        return sessions
+
+    offset = 0
+    if os.path.exists(snapshot_path()):
+        with open(snapshot_path(), "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        sessions = {game_id: _deserialize_session(s) for game_id, s in snapshot["sessions"].items()}
+        offset = snapshot["offset"]
+        _seq = snapshot["seq"]
+
+    if os.path.exists(log_path()):
+        for event, offset in _read_lines(log_path(), offset):
+            apply_event(sessions, event)
+            _seq = max(_seq, event["seq"])
+
+        # Drop a torn final line so the next append starts on a clean line.
+        if os.path.getsize(log_path()) > offset:
+            with open(log_path(), "r+b") as f:
+                f.truncate(offset)
+
+    with _lock:
+        _logged_sessions = copy.deepcopy(sessions)
+    return sessions
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Event log replay benchmark
+
+Re-drives a recorded FinLife event log against the Flask app as fast as possible,
+with Nessie and Gemini replaced by in-memory fakes, and reports throughput and
+per-endpoint latency.
+
+Usage examples:
+  python replay.py                               # Replays data/events.jsonl
+  python replay.py --log path/to/events.jsonl --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import itertools
+import os
+import statistics
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+# Replayed traffic must not be appended to the log being replayed or recovered from it.
+os.environ["FINLIFE_EVENT_LOG_DIR"] = ""
+
+import ai_agent  # noqa: E402
+import api_client  # noqa: E402
+import app as finlife  # noqa: E402
+import event_log  # noqa: E402
+
+CANNED_MCQ = {
+    "scenario_title": "Replay Dilemma",
+    "scenario_description": "A recorded decision point.",
+    "choices": [
+        {"description": "Spend. (-$500.00)", "financial_impact": {"action": "WITHDRAWAL", "amount": 500, "description": "Replay Purchase"}},
+        {"description": "Earn. (+$500.00)", "financial_impact": {"action": "DEPOSIT", "amount": 500, "description": "Replay Gig"}},
+        {"description": "Skip. (+$0.00)", "financial_impact": {"action": "DEPOSIT", "amount": 0, "description": "Replay Skip"}},
+    ],
+}
+CANNED_JO = {
+    "scenario_title": "Replay Offer",
+    "scenario_description": "A recorded job offer.",
+    "choices": [
+        {"description": "Accept. (Income: $60,000.00)", "financial_impact": {"income": 60000, "title": "Replay Analyst"}},
+        {"description": "Decline. (Income: $0.00)", "financial_impact": {"income": 0, "title": "Unemployed"}},
+    ],
+}
+CANNED_FS = {"persona_title": "The Replayer", "summary": "Replayed.", "best_decision": "-", "worst_decision": "-"}
+
+
+class FakeNessie:
+    """In-memory stand-in for the api_client functions the app calls."""
+
+    def __init__(self):
+        self.ids = itertools.count()
+        self.balances: Dict[str, float] = {}
+        self.transactions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    def install(self):
+        api_client.create_customer = lambda first_name, last_name: f"customer-{next(self.ids)}"
+        api_client.create_account = self.create_account
+        api_client.make_deposit = lambda *args: self.post("deposit", *args)
+        api_client.make_withdrawal = lambda *args: self.post("withdrawal", *args)
+        api_client.get_account_balance = lambda account_id: self.balances[account_id]
+        api_client.fetch_all_transactions_for_account = lambda account_id: sorted(
+            (dict(t) for t in self.transactions[account_id]), key=lambda t: t["transaction_date"], reverse=True
+        )
+        api_client.get_all_transactions_for_account = api_client.fetch_all_transactions_for_account
+
+    def create_account(self, customer_id, balance):
+        account_id = f"account-{next(self.ids)}"
+        self.balances[account_id] = balance
+        return account_id
+
+    def post(self, kind, account_id, date, amount, description):
+        self.balances[account_id] += amount if kind == "deposit" else -amount
+        self.transactions[account_id].append({
+            "_id": str(next(self.ids)), "type": kind, "transaction_date": date,
+            "amount": amount, "description": description,
+        })
+
+
+def install_fake_model():
+    canned = {id(ai_agent.MCQ_SCHEMA): CANNED_MCQ, id(ai_agent.JO_SCHEMA): CANNED_JO, id(ai_agent.FS_SCHEMA): CANNED_FS}
+
+    # Prompts are still built, so prompt construction stays part of the measured cost.
+    def fake_call(prompt, schema=None, validator=None):
+        data = copy.deepcopy(canned[id(schema)])
+        return validator(data) if validator else data
+
+    ai_agent._call_generative_model = fake_call
+
+
+def replay(events: List[Dict[str, Any]], client) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    game_ids: Dict[str, str] = {}
+    cursors: Dict[str, int] = defaultdict(int)
+
+    for event in events:
+        recorded_id = event["gameId"]
+        data = event.get("data") or {}
+        if event["type"] == "start":
+            path, body = "/game/start", data
+        elif recorded_id not in game_ids:
+            continue  # Game began before the recorded window.
+        elif event["type"] == "advance":
+            path, body = "/game/advance-year", {}
+        elif event["type"] == "decision_mcq":
+            path, body = "/decision/mcq", {"choice": data["choice"]}
+        elif event["type"] == "decision_job":
+            path, body = "/decision/job", {"choice": data["choice"]}
+        elif event["type"] == "turn":
+            path, body = "/game/turn", {"choice": data["choice"], "idempotencyKey": data["idempotencyKey"],
+                                        "since": cursors[recorded_id]}
+        elif event["type"] == "fast_forward":
+            path, body = "/game/fast-forward", {"targetAge": data["targetAge"]}
+        else:
+            continue
+
+        if recorded_id in game_ids:
+            body = dict(body, gameId=game_ids[recorded_id])
+        start = time.perf_counter()
+        resp = client.post(path, json=body)
+        latencies[path].append(time.perf_counter() - start)
+
+        result = resp.get_json(silent=True) or {}
+        if event["type"] == "start" and "gameId" in result:
+            game_ids[recorded_id] = result["gameId"]
+        if "cursor" in result:
+            cursors[recorded_id] = result["cursor"]
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a FinLife event log against the app with mocked upstreams.")
+    parser.add_argument("--log", type=str, default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", event_log.LOG_FILENAME), help="Event log to replay")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of times to replay the log")
+    args = parser.parse_args()
+
+    events = list(event_log.read_events(args.log))
+    if not events:
+        print(f"[error] No events found in {args.log}.")
+        return
+
+    FakeNessie().install()
+    install_fake_model()
+    client = finlife.app.test_client()
+
+    all_latencies: Dict[str, List[float]] = defaultdict(list)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        # Fresh recorded-to-replayed id mapping each pass, so every pass replays every game.
+        for path, values in replay(events, client).items():
+            all_latencies[path].extend(values)
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(v) for v in all_latencies.values())
+    print(f"Replayed {total} requests from {len(events)} events in {elapsed:.3f}s ({total / elapsed:.1f} req/s)")
+    print("\nendpoint\tcount\tp50_ms\tp95_ms")
+    for path, values in sorted(all_latencies.items()):
+        values.sort()
+        p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+        print(f"{path}\t{len(values)}\t{1000 * statistics.median(values):.2f}\t{1000 * p95:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 document.addEventListener('DOMContentLoaded', () => {
     const API_BASE_URL = 'http://127.0.0.1:5000';
     const START_BALANCE = 10000;
+    const TURN_MAX_ATTEMPTS = 4;
+    const TURN_RETRY_DELAY_MS = 500;
     let gameId = null;
     let transactionLog = [];
+    let historyCursor = 0;
+    let historyEtag = null;
+    let pendingTurn = null;
     let currentPlayerState = {}; 
+    let assetManifest = null;
 
     const loader = document.getElementById('loader');
     const startScreen = document.getElementById('start-screen');
@@ -33,6 +39,33 @@ document.addEventListener('DOMContentLoaded', () => {
     const oldGuyVideo = 'vid-old-guy';
 
     // --- VIDEO CONTROL FUNCTIONS ---
+    async function loadAssetManifest() {
+        try {
+            const response = await fetch(`${API_BASE_URL}/static/manifest.json`);
+            assetManifest = await response.json();
+        } catch (error) {
+            console.error("Failed to load asset manifest:", error);
+        }
+    }
+
+    function loadClip(video) {
+        if (video.getAttribute('src')) return;
+        const clip = video.dataset.clip;
+        const versionedUrl = assetManifest?.assets?.[clip];
+        video.src = versionedUrl ? `${API_BASE_URL}${versionedUrl}` : clip;
+    }
+
+    function preloadStageForAge(age) {
+        const stage = assetManifest?.stages.find(s => age >= s.minAge && age <= s.maxAge);
+        if (!stage) return;
+        bitmojiContainer.querySelectorAll('video').forEach(video => {
+            if (stage.clips.includes(video.dataset.clip)) {
+                video.preload = 'auto';
+                loadClip(video);
+            }
+        });
+    }
+
     function hideAllVideos() {
         bitmojiContainer.querySelectorAll('video').forEach(vid => vid.classList.add('hidden'));
     }
@@ -41,6 +74,7 @@ document.addEventListener('DOMContentLoaded', () => {
         hideAllVideos();
         const video = document.getElementById(videoId);
         if (video) {
+            loadClip(video);
             video.classList.remove('hidden');
             video.play().catch(e => console.error("Video play failed:", e));
         }
@@ -56,12 +90,15 @@ document.addEventListener('DOMContentLoaded', () => {
         loader.classList.add('hidden');
     }
 
+    loadAssetManifest();
+
     // --- CORE GAME FUNCTIONS ---
     function updateStatusUI(playerState) {
         if (!playerState) return;
         currentPlayerState = playerState;
         if (playerState.age) {
             ageDisplay.textContent = `Age: ${playerState.age}`;
+            preloadStageForAge(playerState.age + 1);
         }
         if (playerState.hasOwnProperty('balance')) {
             moneyDisplay.textContent = `$${Math.round(playerState.balance).toLocaleString()}`;
@@ -132,15 +169,25 @@ document.addEventListener('DOMContentLoaded', () => {
         moneyDisplay.textContent = `$${Math.round(balance).toLocaleString()}`;
     }
 
+    async function fetchHistoryDelta() {
+        const headers = { 'Content-Type': 'application/json' };
+        if (historyEtag) headers['If-None-Match'] = historyEtag;
+        const response = await fetch(`${API_BASE_URL}/game/history`, {
+            method: 'POST',
+            headers,
+            body: JSON.stringify({ gameId, since: historyCursor })
+        });
+        if (response.status === 304) return;
+        const data = await response.json();
+        if (!response.ok || data.error) throw new Error(data.error || `Server error: ${response.status}`);
+        historyEtag = response.headers.get('ETag');
+        historyCursor = data.cursor;
+        transactionLog = (data.transaction_history || []).concat(transactionLog);
+    }
+
     async function updateTransactionLogAndBalance() {
         try {
-            const response = await fetch(`${API_BASE_URL}/game/history`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ gameId })
-            });
-            const data = await response.json();
-            transactionLog = data.transaction_history || [];
+            await fetchHistoryDelta();
             recalculateBalanceFromTransactions();
         } catch (error) {
             console.error("Failed to fetch transaction log:", error);
@@ -148,39 +195,73 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // EVENT LISTENERS AND HANDLERS 
-    async function handleChoiceClick(choice) {
+    async function postTurn(body) {
+        // Network failures, 5xx (partial failure) and 409 (the previous attempt is still running) are
+        // retried with backoff under the same idempotency key, so the server resumes the turn instead of
+        // applying the choice or the year twice.
+        for (let attempt = 1; ; attempt++) {
+            let response = null;
+            try {
+                response = await fetch(`${API_BASE_URL}/game/turn`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(body)
+                });
+            } catch (error) {
+                if (attempt >= TURN_MAX_ATTEMPTS) throw error;
+            }
+            if (response && (attempt >= TURN_MAX_ATTEMPTS || (response.status < 500 && response.status !== 409))) {
+                return response;
+            }
+            await new Promise(resolve => setTimeout(resolve, TURN_RETRY_DELAY_MS * 2 ** (attempt - 1)));
+        }
+    }
+
+    function handleChoiceClick(choice) {
+        pendingTurn = { choice, idempotencyKey: crypto.randomUUID() };
+        return submitPendingTurn();
+    }
+
+    async function submitPendingTurn() {
         showLoader();
         choicesContainer.innerHTML = '';
-        const endpoint = choice.financial_impact.hasOwnProperty('action') ? '/decision/mcq' : '/decision/job';
 
         try {
-            const response = await fetch(`${API_BASE_URL}${endpoint}`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ gameId, choice })
-            });
+            const response = await postTurn({ gameId, ...pendingTurn, since: historyCursor });
             const data = await response.json();
+            // 410: the game moved on without this turn, so there is nothing left to resend.
+            if (response.status === 410) pendingTurn = null;
             if (!response.ok || data.error) throw new Error(data.error || `Server error: ${response.status}`);
-            scenarioTitle.textContent = "Decision Made";
-            storyText.textContent = `You decided: ${choice.description}`;
-            if (data.playerState) {
-                updateStatusUI(data.playerState);
+            pendingTurn = null;
+            if (data.gameOver) {
+                showScorecard(data.finalSummary);
+                splitContainer.classList.add('hidden');
+                return;
             }
-            await updateTransactionLogAndBalance();
+            transactionLog = (data.transaction_history || []).concat(transactionLog);
+            historyCursor = data.cursor;
+            historyEtag = null;
+            updateStatusUI(data.playerState);
+            renderEvent(data.nextEvent);
+            recalculateBalanceFromTransactions();
         } catch (error) {
             console.error("handleChoiceClick Error:", error);
             alert(`Error processing decision: ${error.message}`);
-        } finally {
-            hideLoader();
+            // "Next Year" resends this turn with the same key rather than calling advance-year,
+            // so a partially applied turn is finished instead of skipped.
             choicesContainer.classList.add('hidden');
             nextYearContainer.classList.remove('hidden');
-
-          
             splitContainer.classList.add('hidden');
+        } finally {
+            hideLoader();
         }
     }
 
     nextYearButton.addEventListener('click', async () => {
+        if (pendingTurn) {
+            await submitPendingTurn();
+            return;
+        }
         showLoader();
         try {
             const response = await fetch(`${API_BASE_URL}/game/advance-year`, {
@@ -213,13 +294,7 @@ document.addEventListener('DOMContentLoaded', () => {
         if (!isVisible) return;
         historyDropdown.innerHTML = '<li>Loading...</li>';
         try {
-            const response = await fetch(`${API_BASE_URL}/game/history`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ gameId })
-            });
-            const data = await response.json();
-            transactionLog = data.transaction_history || [];
+            await fetchHistoryDelta();
             historyDropdown.innerHTML = '';
             if (transactionLog.length > 0) {
                 transactionLog.forEach(item => {
@@ -0,0 +1,78 @@
+import os
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_EXTENSIONS = {".html", ".js", ".css", ".png", ".mp4"}
+COMPRESSIBLE_EXTENSIONS = {".html", ".js", ".css"}
+
+# Avatar clips shown for each age range, mirroring the playlists in script.js.
+AGE_STAGES = [
+    {"stage": "kid-hi", "minAge": 16, "maxAge": 16, "clips": ["2.mp4"]},
+    {"stage": "kid", "minAge": 17, "maxAge": 23, "clips": ["6.mp4", "3.mp4", "4.mp4", "5.mp4"]},
+    {"stage": "adult", "minAge": 24, "maxAge": 49, "clips": ["8.mp4", "9.mp4", "10.mp4", "11.mp4"]},
+    {"stage": "old", "minAge": 50, "maxAge": 67, "clips": ["12.mp4"]},
+]
+
+# Assets that other assets reference by plain filename; those references are rewritten
+# to content-hashed URLs when served, so they pick up immutable caching.
+ASSET_REFERENCES = {"index.html": ["style.css", "script.js", "logo_draft.png"]}
+
+_asset_cache = {}
+
+def is_servable(filename):
+    return (
+        os.path.basename(filename) == filename
+        and os.path.splitext(filename)[1] in ASSET_EXTENSIONS
+        and os.path.isfile(os.path.join(ASSET_DIR, filename))
+    )
+
+def get_asset(filename):
+    """Return the file's content hash and any precompressed variants, rebuilt only when the file changes.
+
+    For assets with rewritten references, "body" holds the rewritten content to serve
+    in place of the file on disk; it is None for everything else.
+    """
+    path = os.path.join(ASSET_DIR, filename)
+    stat = os.stat(path)
+    refs = [(ref, get_asset(ref)["hash"]) for ref in ASSET_REFERENCES.get(filename, [])]
+    cached = _asset_cache.get(filename)
+    if cached and cached["mtime"] == stat.st_mtime and cached["size"] == stat.st_size and cached["refs"] == refs:
+        return cached
+
+    with open(path, "rb") as f:
+        content = f.read()
+    for ref, ref_hash in refs:
+        content = content.replace(f'"{ref}"'.encode(), f'"/static/{ref}?v={ref_hash}"'.encode())
+    asset = {
+        "path": path,
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "refs": refs,
+        "hash": hashlib.sha256(content).hexdigest()[:16],
+        "body": content if refs else None,
+        "variants": {}
+    }
+    if os.path.splitext(filename)[1] in COMPRESSIBLE_EXTENSIONS:
+        asset["variants"]["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+        if brotli is not None:
+            asset["variants"]["br"] = brotli.compress(content, quality=11)
+    _asset_cache[filename] = asset
+    return asset
+
+def asset_url(filename):
+    return f"/static/{filename}?v={get_asset(filename)['hash']}"
+
+def build_manifest():
+    return {
+        "stages": AGE_STAGES,
+        "assets": {
+            name: asset_url(name)
+            for name in sorted(os.listdir(ASSET_DIR)) if is_servable(name)
+        }
+    }